@@ -3,11 +3,66 @@ Git Handler Module
 Handles all Git operations: reading repos, getting diffs, analyzing changes
 """
 
+import functools
+import mmap
 import os
-from pathlib import Path
-from typing import Dict, List, Optional
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 from git import Repo, InvalidGitRepositoryError, GitCommandError
 
+if TYPE_CHECKING:
+    from utils.diff_cache import DiffCache
+    from utils.diff_parser import FileDiff
+
+try:
+    # pygit2 talks to libgit2 in-process - no 'git' subprocess per diff.
+    # It's optional: without libgit2 we fall back to GitPython.
+    import pygit2
+    from pygit2.enums import AttrCheck
+except ImportError:
+    pygit2 = None
+
+
+# Errors a diff call can raise, whichever backend produced it
+if pygit2 is not None:
+    _DIFF_ERRORS = (GitCommandError, subprocess.CalledProcessError, pygit2.GitError, KeyError)
+else:
+    _DIFF_ERRORS = (GitCommandError, subprocess.CalledProcessError)
+
+# Extra options for every 'git diff' we run. Rename detection is off: we
+# never report renames, and finding them is a large share of diff time.
+# (-M0/-C0 aren't used - those lower the similarity threshold to 0% and
+# would make git pair up *more* files as renames, not fewer.)
+# External diff drivers and textconv filters can run arbitrary, slow
+# programs (or expand a binary into pages of text), and submodules are
+# whole other repositories - none of that belongs in a commit message.
+# Binary files only ever show up as a one-line "Binary files differ".
+_GIT_DIFF_OPTIONS = (
+    '--no-renames',
+    '--no-color',
+    '--no-ext-diff',
+    '--no-textconv',
+    '--ignore-submodules=all',
+    '--histogram',  # usually faster than the default on big text diffs
+)
+
+# git's well-known empty tree - what staged changes are compared against
+# before the first commit. libgit2 knows it without it being stored.
+_EMPTY_TREE_SHA = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+# How many staged diffs (and their line counts) to remember
+_STAGED_CACHE_SIZE = 64
+
+_T = TypeVar('_T')
+
+# Files at least this big are memory-mapped instead of read into memory
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Rough size of one diff line, used to guess patch size from line counts
+_AVG_LINE_BYTES = 80
+
 
 class GitHandler:
     """
@@ -17,21 +72,121 @@ class GitHandler:
     It can read repositories, get changes, and understand what's been modified.
     """
     
-    def __init__(self, repo_path: Optional[str] = None):
+    def __init__(
+        self,
+        repo_path: Optional[str] = None,
+        backend: str = "pygit2",
+        max_diff_files: int = 50,
+        max_diff_bytes: int = 1_000_000,
+        read_only: bool = False,
+        disk_cache: bool = False,
+    ):
         """
         Initialize the Git handler
         
         Args:
             repo_path: Path to git repository. If None, uses current directory.
+            backend: "pygit2" (diffs computed in-process by libgit2) or
+                     "gitpython" (diffs computed by running 'git diff').
+                     If pygit2 isn't installed we quietly use "gitpython".
+            max_diff_files: get_all_changes returns only a summary when more
+                            files than this have changed
+            max_diff_bytes: ...or when the diff would be roughly this big
+            read_only: Never write to the repository, and read file contents
+                       from git's object database (HEAD by default) instead
+                       of the working directory. Works on bare repositories.
+                       Uses pygit2 whenever it's installed.
+            disk_cache: Keep get_parsed_staged_changes results on disk
+                        (~/.cache/sprout), so they survive between runs
         
         Why Optional[str]? It means repo_path can be a string OR None.
+        
+        Nothing is opened yet - the repository is loaded the first time it's
+        needed, so creating a handler is cheap.
         """
+        if backend not in ("pygit2", "gitpython"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+        
         # If no path provided, use current directory
         self.repo_path = repo_path or os.getcwd()
-        self.repo = None
-        self._load_repository()
+        self.backend = backend if pygit2 is not None else "gitpython"
+        if read_only and pygit2 is not None:
+            self.backend = "pygit2"
+        self.read_only = read_only
+        self.disk_cache = disk_cache
+        self.max_diff_files = max_diff_files
+        self.max_diff_bytes = max_diff_bytes
+        self._cat_file_proc = None  # started on first use, see _cat_file()
+        self._commit_count = None   # (HEAD sha, count), see _count_commits()
+        
+        # Staged diffs only change when HEAD or the index does, so remember
+        # the last few keyed by that state (see _diff_cache_key()). Plain
+        # dicts rather than functools.lru_cache around a bound method, which
+        # would keep a reference to self and stop __del__ from running.
+        self._staged_changes_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._staged_stats_cache: "OrderedDict[Tuple, Tuple[int, int, int]]" = OrderedDict()
+        self._staged_git2_diff = None  # (cache key, Diff), see _staged_diff()
+    
+    @functools.cached_property
+    def repo(self) -> Repo:
+        """
+        The GitPython repository, loaded on first use
+        
+        cached_property runs this once and then stores the result on the
+        instance, so later accesses are a plain attribute lookup.
+        """
+        return self._load_repository()
     
-    def _load_repository(self) -> None:
+    @functools.cached_property
+    def _git2_repo(self) -> Optional["pygit2.Repository"]:
+        """
+        The libgit2 repository (pygit2 backend only), opened on first use
+        
+        Opened straight from repo_path, so the pygit2 backend never has to
+        load the GitPython repository just to compute a diff.
+        """
+        if self.backend != "pygit2":
+            return None
+        
+        git_dir = pygit2.discover_repository(self.repo_path)
+        if git_dir is None:
+            raise self._not_a_repository()
+        return pygit2.Repository(git_dir)
+    
+    @functools.cached_property
+    def _parsed_diff_cache(self) -> Optional["DiffCache"]:
+        """
+        The on-disk cache of parsed diffs (only if disk_cache=True)
+        """
+        if not self.disk_cache:
+            return None
+        
+        # Imported here so this file can still be run on its own
+        from utils.diff_cache import DiffCache
+        return DiffCache()
+    
+    @property
+    def _git_dir(self) -> str:
+        """
+        Path of the .git directory, from whichever backend is loaded
+        """
+        if self._git2_repo is not None:
+            # libgit2 adds a trailing slash; normalize so both backends agree
+            return os.path.normpath(self._git2_repo.path)
+        return self.repo.git_dir
+    
+    @property
+    def _is_bare(self) -> bool:
+        """
+        True for a bare repository opened with pygit2 (read_only=True)
+        
+        A bare repository has no index and no working directory, so nothing
+        is ever staged or modified. libgit2 would instead diff HEAD against
+        an empty index (every file "deleted") or fail to scan the workdir.
+        """
+        return self._git2_repo is not None and self._git2_repo.is_bare
+    
+    def _load_repository(self) -> Repo:
         """
         Load the Git repository
         
@@ -43,13 +198,20 @@ class GitHandler:
         """
         try:
             # Repo() is from GitPython - it connects to a git repository
-            self.repo = Repo(self.repo_path, search_parent_directories=True)
-            print(f"✅ Loaded repository: {self.repo.working_dir}")
+            repo = Repo(self.repo_path, search_parent_directories=True)
+            print(f"✅ Loaded repository: {repo.working_dir}")
+            return repo
         except InvalidGitRepositoryError:
-            raise InvalidGitRepositoryError(
-                f"❌ Not a git repository: {self.repo_path}\n"
-                f"Run 'git init' to create one, or navigate to an existing repo."
-            )
+            raise self._not_a_repository()
+    
+    def _not_a_repository(self) -> InvalidGitRepositoryError:
+        """
+        Build the error shown when repo_path isn't inside a git repository
+        """
+        return InvalidGitRepositoryError(
+            f"❌ Not a git repository: {self.repo_path}\n"
+            f"Run 'git init' to create one, or navigate to an existing repo."
+        )
     
     def is_repo_dirty(self) -> bool:
         """
@@ -69,20 +231,131 @@ class GitHandler:
         Returns:
             String containing the diff output
         
-        This is like running 'git diff --cached' in the terminal
+        This is like running 'git diff --cached' in the terminal.
+        Repeated calls are answered from a cache until HEAD or the
+        index changes.
         """
         try:
-            # Get diff between HEAD (last commit) and staging area
-            diff = self.repo.git.diff('--cached', '--unified=3')
-            
-            if not diff:
-                return ""
-            
-            return diff
-        except GitCommandError as e:
+            return self._staged_changes()
+        except _DIFF_ERRORS as e:
             print(f"❌ Error getting staged changes: {e}")
             return ""
     
+    def _staged_changes(self) -> str:
+        """
+        Staged diff through the cache (errors are raised)
+        """
+        cache_key = self._diff_cache_key()
+        if cache_key is None:
+            return self._read_staged_changes()
+        return self._lru_get(self._staged_changes_cache, cache_key, self._read_staged_changes)
+    
+    def _read_staged_changes(self) -> str:
+        """
+        Compute the staged diff (no caching, errors are raised)
+        """
+        if self._is_bare:
+            return ""
+        
+        if self._git2_repo is not None:
+            # Only now do we turn the diff into patch text
+            return self._patch_text(self._staged_diff())
+        
+        # Get diff between HEAD (last commit) and staging area
+        diff = self.repo.git.diff('--cached', '--unified=3', *_GIT_DIFF_OPTIONS)
+        
+        if not diff:
+            return ""
+        
+        return diff
+    
+    @staticmethod
+    def _lru_get(cache: "OrderedDict[Tuple, _T]", key: Tuple, compute: Callable[[], _T]) -> _T:
+        """
+        Look key up in a small LRU cache, computing and storing it on a miss
+        
+        The least recently used entry is dropped once there are more than
+        _STAGED_CACHE_SIZE of them.
+        """
+        try:
+            cache.move_to_end(key)
+            return cache[key]
+        except KeyError:
+            pass
+        
+        value = compute()
+        cache[key] = value
+        if len(cache) > _STAGED_CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
+    
+    def _diff_cache_key(self) -> Optional[Tuple]:
+        """
+        Describe the current HEAD + index state for the diff cache
+        
+        Returns:
+            (HEAD sha, index mtime, index size, index inode), or None if
+            there's nothing to key on (no commits, no index file, or
+            GIT_INDEX_FILE points git at some other index)
+        
+        Git rewrites the index through a rename, so any staging operation
+        changes at least its inode - no need to read the index itself.
+        """
+        if os.environ.get('GIT_INDEX_FILE'):
+            # Set inside commit hooks for 'git commit <paths>': 'git diff
+            # --cached' then reads a temporary index we don't track
+            return None
+        
+        try:
+            if self._git2_repo is not None:
+                if self._git2_repo.head_is_unborn:
+                    return None
+                head_sha = str(self._git2_repo.head.target)
+            else:
+                head_sha = self.repo.head.commit.hexsha
+            
+            index_stat = os.stat(os.path.join(self._git_dir, 'index'))
+        except (ValueError, FileNotFoundError):
+            return None
+        
+        return (head_sha, index_stat.st_mtime_ns, index_stat.st_size, index_stat.st_ino)
+    
+    def get_parsed_staged_changes(self) -> List["FileDiff"]:
+        """
+        Get the staged changes already parsed by DiffParser
+        
+        Returns:
+            List of FileDiff, one per staged file
+        
+        With disk_cache=True the result is saved on disk, keyed by HEAD and
+        the index state. The next run - even a brand new process, like an
+        editor hook firing on every save - gets it back without running
+        git or the parser at all.
+        """
+        # Imported here so this file can still be run on its own
+        from utils.diff_parser import DiffParser
+        
+        disk_cache = self._parsed_diff_cache
+        cache_key = self._diff_cache_key() if disk_cache is not None else None
+        
+        if cache_key is not None:
+            head_sha, index_mtime, index_size, _ = cache_key
+            cached = disk_cache.get(self._git_dir, head_sha, index_mtime, index_size)
+            if cached is not None:
+                return cached
+        
+        try:
+            parsed = DiffParser.parse_diff(self._staged_changes())
+        except _DIFF_ERRORS as e:
+            # Don't save a failed diff as "nothing staged" for later runs
+            print(f"❌ Error getting staged changes: {e}")
+            return []
+        
+        if cache_key is not None:
+            disk_cache.put(self._git_dir, head_sha, index_mtime, index_size, parsed)
+        
+        return parsed
+    
     def get_unstaged_changes(self) -> str:
         """
         Get the diff of unstaged changes (modified but not 'git add'ed)
@@ -90,20 +363,101 @@ class GitHandler:
         Returns:
             String containing the diff output
         
-        This is like running 'git diff' in the terminal
+        This is like running 'git diff' in the terminal.
+        Not cached: editing a file changes this diff without touching
+        HEAD or the index.
         """
+        if self._is_bare:
+            return ""
+        
         try:
+            if self._git2_repo is not None:
+                return self._patch_text(self._unstaged_diff())
+            
             # Get diff of working directory vs staging area
-            diff = self.repo.git.diff('--unified=3')
+            diff = self.repo.git.diff('--unified=3', *_GIT_DIFF_OPTIONS)
             
             if not diff:
                 return ""
             
             return diff
-        except GitCommandError as e:
+        except _DIFF_ERRORS as e:
             print(f"❌ Error getting unstaged changes: {e}")
             return ""
     
+    def _staged_diff(self) -> "pygit2.Diff":
+        """
+        libgit2 diff between HEAD and the staging area
+        
+        A pygit2 Diff is cheap until you ask for diff.patch - the list of
+        changed files (diff.deltas) is available without building any text.
+        
+        libgit2 only looks for renames when find_similar() is called on
+        the result, which we never do.
+        
+        The last Diff is kept until HEAD or the index changes, so the line
+        counts and the patch text of the same staged state share one Diff.
+        """
+        self._refresh_git2_index()
+        cache_key = self._diff_cache_key()
+        if cache_key is not None and self._staged_git2_diff is not None:
+            last_key, last_diff = self._staged_git2_diff
+            if last_key == cache_key:
+                return last_diff
+        
+        flags = pygit2.GIT_DIFF_NORMAL | pygit2.GIT_DIFF_IGNORE_SUBMODULES
+        
+        if self._git2_repo.head_is_unborn:
+            # No commits yet (about to make the first one): everything
+            # staged is new, so compare the index to an empty tree
+            empty_tree = self._git2_repo[_EMPTY_TREE_SHA]
+            diff = self._git2_repo.index.diff_to_tree(
+                empty_tree, flags=flags, context_lines=3
+            )
+        else:
+            diff = self._git2_repo.diff('HEAD', cached=True, flags=flags, context_lines=3)
+        
+        if cache_key is not None:
+            self._staged_git2_diff = (cache_key, diff)
+        return diff
+    
+    def _unstaged_diff(self, include_untracked: bool = False) -> "pygit2.Diff":
+        """
+        libgit2 diff between the staging area and the working directory
+        
+        Args:
+            include_untracked: Also report new files not added to git yet
+        """
+        self._refresh_git2_index()
+        flags = pygit2.GIT_DIFF_NORMAL | pygit2.GIT_DIFF_IGNORE_SUBMODULES
+        if include_untracked:
+            flags |= (pygit2.GIT_DIFF_INCLUDE_UNTRACKED
+                      | pygit2.GIT_DIFF_RECURSE_UNTRACKED_DIRS)
+        return self._git2_repo.diff(flags=flags, context_lines=3)
+    
+    def _refresh_git2_index(self) -> None:
+        """
+        Re-read the index if it changed on disk since libgit2 loaded it
+        
+        libgit2 keeps the index in memory, so without this a long-lived
+        handler would keep diffing against whatever was staged at the time
+        of the first call.
+        """
+        self._git2_repo.index.read(False)  # False = only if the file changed
+    
+    @staticmethod
+    def _patch_text(diff: "pygit2.Diff") -> str:
+        """
+        Render a pygit2 Diff as patch text, formatted like 'git diff' output
+        
+        GitPython strips the trailing newline from command output, so we do
+        the same to keep both backends interchangeable.
+        """
+        patch = diff.patch
+        if not patch:
+            return ""
+        return patch.rstrip("\n")
+    
     def get_all_changes(self) -> str:
         """
         Get both staged AND unstaged changes
@@ -111,16 +465,173 @@ class GitHandler:
         Returns:
             Combined diff of all changes
         
-        Useful when user hasn't staged anything yet
+        Useful when user hasn't staged anything yet.
+        
+        If the changes are too big (see max_diff_files / max_diff_bytes),
+        a one-line summary is returned instead, so a huge modified file
+        doesn't get loaded into memory as one giant string.
         """
-        staged = self.get_staged_changes()
-        unstaged = self.get_unstaged_changes()
+        if self._is_bare:
+            return ""
+        
+        if self._git2_repo is None:
+            # Each probe and diff is a separate 'git' process, and threads
+            # waiting on a subprocess don't hold the GIL - so run them in
+            # pairs: both probes, then (if they're small enough) both diffs.
+            # Load the repository here first - cached_property has no lock,
+            # so two threads touching it at once could each build a Repo.
+            self.repo
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                staged_stats = executor.submit(self._staged_summary_stats)
+                unstaged_stats = executor.submit(self._read_summary_stats, False)
+                summary = self._oversized_diff_summary(
+                    staged_stats.result, unstaged_stats.result
+                )
+                if summary:
+                    return summary
+                
+                staged_future = executor.submit(self.get_staged_changes)
+                unstaged_future = executor.submit(self.get_unstaged_changes)
+                staged = staged_future.result()
+                unstaged = unstaged_future.result()
+        else:
+            # libgit2 diffs are in-process (no process start-up to hide),
+            # and one pygit2 Repository shouldn't be used from two threads.
+            # Build each side's Diff once: its stats are the probe, and the
+            # patch comes from that same Diff (the staged one via the cache)
+            try:
+                unstaged_diff = self._unstaged_diff()
+            except _DIFF_ERRORS as e:
+                print(f"❌ Error getting unstaged changes: {e}")
+                unstaged_diff = None
+            
+            summary = self._oversized_diff_summary(
+                self._staged_summary_stats,
+                lambda: self._diff_stats(unstaged_diff) if unstaged_diff else (0, 0, 0),
+            )
+            if summary:
+                return summary
+            
+            staged = self.get_staged_changes()
+            unstaged = self._unstaged_patch_text(unstaged_diff) if unstaged_diff else ""
         
         # Combine both diffs
         if staged and unstaged:
             return f"{staged}\n\n{unstaged}"
         return staged or unstaged
     
+    def _unstaged_patch_text(self, diff: "pygit2.Diff") -> str:
+        """
+        Patch text of an unstaged Diff, reporting errors like get_unstaged_changes
+        """
+        try:
+            return self._patch_text(diff)
+        except _DIFF_ERRORS as e:
+            print(f"❌ Error getting unstaged changes: {e}")
+            return ""
+    
+    def _oversized_diff_summary(
+        self,
+        read_staged: Callable[[], Tuple[int, int, int]],
+        read_unstaged: Callable[[], Tuple[int, int, int]],
+    ) -> Optional[str]:
+        """
+        Check whether the full diff is too big to build
+        
+        Args:
+            read_staged: Returns the staged (files, additions, deletions)
+            read_unstaged: Same for the unstaged changes
+        
+        Returns:
+            Summary text if it's over the limits, None if it's fine
+        
+        Line counts are far cheaper to get than the patch itself.
+        """
+        try:
+            staged = read_staged()
+            unstaged = read_unstaged()
+        except _DIFF_ERRORS:
+            # Let the real diff calls report the problem
+            return None
+        
+        files = staged[0] + unstaged[0]
+        insertions = staged[1] + unstaged[1]
+        deletions = staged[2] + unstaged[2]
+        estimated_bytes = (insertions + deletions) * _AVG_LINE_BYTES
+        
+        if files <= self.max_diff_files and estimated_bytes <= self.max_diff_bytes:
+            return None
+        
+        return (
+            f"⚠️  Diff too large to show in full - "
+            f"{files} file(s) changed: "
+            f"{insertions} addition(s), {deletions} deletion(s)"
+        )
+    
+    def get_summary_stats(self, cached: bool = False) -> Tuple[int, int, int]:
+        """
+        Count changed files and lines without building the diff text
+        
+        Args:
+            cached: True for staged changes, False for unstaged ones
+        
+        Returns:
+            (files changed, additions, deletions)
+        
+        Like DiffParser.get_summary, but git does the counting, so there's
+        no patch to generate or parse.
+        """
+        try:
+            if cached:
+                return self._staged_summary_stats()
+            return self._read_summary_stats(cached=False)
+        except _DIFF_ERRORS as e:
+            print(f"❌ Error getting change summary: {e}")
+            return 0, 0, 0
+    
+    def _staged_summary_stats(self) -> Tuple[int, int, int]:
+        """
+        Staged line counts, cached like get_staged_changes (errors are raised)
+        """
+        cache_key = self._diff_cache_key()
+        if cache_key is None:
+            return self._read_summary_stats(cached=True)
+        return self._lru_get(
+            self._staged_stats_cache, cache_key, lambda: self._read_summary_stats(cached=True)
+        )
+    
+    def _read_summary_stats(self, cached: bool) -> Tuple[int, int, int]:
+        """
+        Compute get_summary_stats (errors are raised)
+        """
+        if self._is_bare:
+            return 0, 0, 0
+        
+        if self._git2_repo is not None:
+            return self._diff_stats(self._staged_diff() if cached else self._unstaged_diff())
+        
+        # --numstat prints "ADDED\tDELETED\tPATH" per file ("-" for binary)
+        args = ['diff', '--numstat', '-z', *_GIT_DIFF_OPTIONS]
+        if cached:
+            args.append('--cached')
+        
+        files = additions = deletions = 0
+        for entry in self._git_paths(*args):
+            added, deleted, _ = entry.split(b'\t', 2)
+            files += 1
+            additions += int(added) if added != b'-' else 0
+            deletions += int(deleted) if deleted != b'-' else 0
+        
+        return files, additions, deletions
+    
+    @staticmethod
+    def _diff_stats(diff: "pygit2.Diff") -> Tuple[int, int, int]:
+        """
+        (files changed, additions, deletions) of a pygit2 Diff
+        """
+        stats = diff.stats
+        return stats.files_changed, stats.insertions, stats.deletions
+    
     def get_changed_files(self) -> List[str]:
         """
         Get list of files that have been modified
@@ -129,57 +640,376 @@ class GitHandler:
             List of file paths
         
         Example: ['src/main.py', 'README.md', 'tests/test_git.py']
+        
+        Staged files come first, then unstaged, then untracked; a file
+        that's in more than one group is listed once.
         """
+        if self._is_bare:
+            return []
+        
         changed_files = []
         
-        # Get staged files
-        staged = self.repo.index.diff("HEAD")
-        for item in staged:
-            changed_files.append(item.a_path)
+        if self._git2_repo is not None:
+            # Only read file names from the deltas - never touch diff.patch
+            changed_files.extend(
+                delta.new_file.path for delta in self._staged_diff().deltas
+            )
+            
+            # libgit2 sorts untracked files in with the modified ones;
+            # hold them back so they come last, like 'git status' has them
+            untracked = []
+            for delta in self._unstaged_diff(include_untracked=True).deltas:
+                if delta.status == pygit2.GIT_DELTA_UNTRACKED:
+                    untracked.append(delta.new_file.path)
+                else:
+                    changed_files.append(delta.new_file.path)
+            changed_files.extend(untracked)
+            
+            # dict.fromkeys drops duplicates but keeps the first-seen order
+            return list(dict.fromkeys(changed_files))
+        
+        # One 'git status' lists staged, unstaged and untracked files
+        # together. core.untrackedCache lets git skip directories that
+        # haven't changed since the last run when looking for new files.
+        options = ['-c', 'core.untrackedCache=true']
+        if self.read_only:
+            # status normally refreshes the index as a side effect
+            options.append('--no-optional-locks')
+        
+        entries = self._git_paths(
+            *options, 'status', '--porcelain=v1', '-z',
+            '--untracked-files=all', '--no-renames',
+        )
         
-        # Get unstaged files
-        unstaged = self.repo.index.diff(None)
-        for item in unstaged:
-            changed_files.append(item.a_path)
+        # Each entry is "XY path": X = staged status, Y = unstaged status,
+        # "??" = untracked (new files not added to git yet)
+        staged, unstaged, untracked = [], [], []
+        for entry in entries:
+            index_status, worktree_status, path = entry[:1], entry[1:2], entry[3:]
+            if index_status == b'?':
+                untracked.append(path)
+                continue
+            if index_status != b' ':
+                staged.append(path)
+            if worktree_status != b' ':
+                unstaged.append(path)
         
-        # Get untracked files (new files not added to git yet)
-        untracked = self.repo.untracked_files
+        changed_files.extend(staged)
+        changed_files.extend(unstaged)
         changed_files.extend(untracked)
         
-        # Remove duplicates and return
-        return list(set(changed_files))
+        # Remove duplicates (keeping order); decode only what we return
+        return [path.decode('utf-8') for path in dict.fromkeys(changed_files)]
     
-    def get_file_content(self, file_path: str) -> Optional[str]:
+    def _git_paths(self, *args: str) -> List[bytes]:
+        """
+        Run a git command that prints NUL-separated paths or entries (-z)
+        
+        Returns:
+            Raw entries in the order git printed them, still as bytes
+        
+        -z keeps paths exactly as stored (no quoting of unusual characters),
+        and splitting on NUL is all the parsing we need.
+        """
+        result = subprocess.run(
+            ['git', *args],
+            cwd=self.repo.working_dir,
+            capture_output=True,
+            check=True,
+        )
+        return [path for path in result.stdout.split(b'\x00') if path]
+    
+    def get_file_content(self, file_path: str, rev: Optional[str] = None) -> Optional[str]:
         """
         Get the content of a specific file
         
         Args:
             file_path: Path to the file
+            rev: If given (e.g. 'HEAD'), read the committed version of the
+                 file from git instead of the working directory
         
         Returns:
             File content as string, or None if file doesn't exist
         """
-        full_path = Path(self.repo.working_dir) / file_path
+        if self.read_only:
+            # Never look at the working directory - it may not even exist
+            return self._read_blob(file_path, rev or 'HEAD')
+        
+        if rev is not None:
+            return self.get_file_contents([file_path], rev=rev)[file_path]
+        
+        if file_path in self._binary_paths([file_path]):
+            print(f"⚠️  Cannot read binary file: {file_path}")
+            return None
+        
+        data = self.get_file_bytes(file_path)
+        if data is None:
+            return None
+        
+        # Decoding happens here, once, at the boundary
+        return self._decode_text(data, file_path)
+    
+    def get_file_bytes(self, file_path: str) -> Optional[Union[bytes, memoryview]]:
+        """
+        Get the raw bytes of a file in the working directory
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            File content as bytes (a memoryview for very large files), or
+            None if file doesn't exist
+        
+        Use this when you need bytes anyway (hashing, tokenizers...) - it
+        skips the text decoding and the extra copy through Python's
+        buffered file layer. Files over _MMAP_THRESHOLD are memory-mapped,
+        so their content is never copied into the process at all.
+        """
+        full_path = os.path.join(self.repo.working_dir, file_path)
         
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            # O_BINARY only exists (and matters) on Windows
+            fd = os.open(full_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
         except FileNotFoundError:
             print(f"⚠️  File not found: {file_path}")
             return None
+        
+        try:
+            size = os.fstat(fd).st_size
+            if size >= _MMAP_THRESHOLD:
+                # The mapping stays valid after we close the file descriptor
+                return memoryview(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+            return os.read(fd, size)
+        finally:
+            os.close(fd)
+    
+    def get_file_contents(self, paths: List[str], rev: str = 'HEAD') -> Dict[str, Optional[str]]:
+        """
+        Get the committed content of many files at once
+        
+        Args:
+            paths: File paths relative to the repository root
+            rev: Revision to read the files from
+        
+        Returns:
+            Dictionary mapping each path to its content, or None if the file
+            doesn't exist at that revision or is binary
+        
+        All files are read through one long-running 'git cat-file --batch'
+        process instead of starting a 'git show' for every file.
+        """
+        binary = self._binary_paths(paths, rev)
+        proc = self._cat_file()
+        contents = {}
+        
+        for path in paths:
+            if path in binary:
+                print(f"⚠️  Cannot read binary file: {path}")
+                contents[path] = None
+                continue
+            
+            if '\n' in path:
+                # Requests are newline-terminated: git would read this as
+                # two requests, and every later reply would be one behind
+                print(f"⚠️  Cannot read a path containing a newline: {path!r}")
+                contents[path] = None
+                continue
+            
+            # Ask for one object, then read its framed reply:
+            #   "<sha> <type> <size>\n<content>\n"  or  "<name> missing\n"
+            proc.stdin.write(f"{rev}:{path}\n".encode('utf-8'))
+            proc.stdin.flush()
+            header = proc.stdout.readline().rstrip(b'\n')
+            
+            # <name> is whatever we asked for, spaces included - check for
+            # these replies before splitting anything
+            if header.endswith((b' missing', b' ambiguous')):
+                print(f"⚠️  File not found: {path} ({rev})")
+                contents[path] = None
+                continue
+            
+            _, object_type, size = header.rsplit(b' ', 2)
+            size = int(size)
+            data = proc.stdout.read(size + 1)[:size]  # drop trailing newline
+            
+            if object_type != b'blob':
+                print(f"⚠️  Not a file: {path} ({rev})")
+                contents[path] = None
+                continue
+            
+            contents[path] = self._decode_text(data, path)
+        
+        return contents
+    
+    def _read_blob(self, file_path: str, rev: str) -> Optional[str]:
+        """
+        Read a file straight from git's object database
+        
+        Args:
+            file_path: Path to the file, relative to the repository root
+            rev: Revision to read it from
+        
+        With pygit2 this is a tree lookup plus a blob read in-process - no
+        open(), no stat(), no subprocess. Without it, we use the cat-file
+        batch process instead.
+        """
+        if self._git2_repo is None:
+            return self.get_file_contents([file_path], rev=rev)[file_path]
+        
+        try:
+            commit = self._git2_repo.revparse_single(rev).peel(pygit2.Commit)
+            # Only the tree entry - the blob itself isn't loaded yet
+            entry = commit.tree[file_path]
+        except (KeyError, ValueError):
+            print(f"⚠️  File not found: {file_path} ({rev})")
+            return None
+        
+        if entry.type_str != 'blob':
+            print(f"⚠️  Not a file: {file_path} ({rev})")
+            return None
+        
+        if file_path in self._binary_paths([file_path], str(commit.id)):
+            print(f"⚠️  Cannot read binary file: {file_path}")
+            return None
+        
+        return self._decode_text(self._git2_repo[entry.id].data, file_path)
+    
+    def _binary_paths(self, paths: List[str], rev: Optional[str] = None) -> Set[str]:
+        """
+        Find which paths .gitattributes marks as binary
+        
+        Args:
+            paths: File paths relative to the repository root
+            rev: Read .gitattributes from this revision (as well as the
+                 index) instead of the working directory
+        
+        Returns:
+            The subset of paths with the 'binary' attribute set
+        
+        Checking the attribute up front means we skip reading known binary
+        files (images, archives...) instead of reading all of one only to
+        fail decoding it. Files that aren't marked still get caught by the
+        UTF-8 decode.
+        """
+        if not paths:
+            return set()
+        
+        if self._git2_repo is not None:
+            # In-process attribute lookup - no subprocess
+            if rev is None:
+                options = {}
+            else:
+                try:
+                    commit = self._git2_repo.revparse_single(rev).peel(pygit2.Commit)
+                except (KeyError, ValueError):
+                    # Let the read itself report the bad revision
+                    return set()
+                options = {
+                    'flags': AttrCheck.INDEX_ONLY | AttrCheck.INCLUDE_COMMIT,
+                    'commit': commit.id,
+                }
+            return {
+                path for path in paths
+                if self._git2_repo.get_attr(path, 'binary', **options) is True
+            }
+        
+        args = ['git', 'check-attr', '-z', '--stdin']
+        if rev is not None and self.repo.git.version_info >= (2, 40):
+            # --source is new in git 2.40; older versions can only look at
+            # the working directory and the index
+            args.append(f'--source={rev}')
+        
+        # One check-attr call for all paths; -z output is
+        # "<path>\0binary\0<set|unset|unspecified>\0" per path
+        try:
+            result = subprocess.run(
+                [*args, 'binary'],
+                cwd=self.repo.working_dir,
+                input=b''.join(path.encode('utf-8') + b'\x00' for path in paths),
+                capture_output=True,
+                check=True,
+            )
+        except subprocess.CalledProcessError:
+            # Not being able to check attributes is no reason to fail a read
+            return set()
+        
+        fields = result.stdout.split(b'\x00')
+        return {
+            fields[i].decode('utf-8')
+            for i in range(0, len(fields) - 2, 3)
+            if fields[i + 2] == b'set'
+        }
+    
+    @staticmethod
+    def _decode_text(data: Union[bytes, memoryview], file_path: str) -> Optional[str]:
+        """
+        Decode file bytes as UTF-8 text, or None for binary files
+        """
+        try:
+            # str() rather than .decode() so memoryviews work too
+            return str(data, 'utf-8')
         except UnicodeDecodeError:
             # Binary file - can't read as text
             print(f"⚠️  Cannot read binary file: {file_path}")
             return None
     
+    def _cat_file(self) -> subprocess.Popen:
+        """
+        Get the 'git cat-file --batch' process, starting it if needed
+        
+        The process stays alive for the lifetime of this handler, so reading
+        N files costs one fork/exec instead of N.
+        """
+        if self._cat_file_proc is None or self._cat_file_proc.poll() is not None:
+            self._cat_file_proc = subprocess.Popen(
+                ['git', 'cat-file', '--batch'],
+                cwd=self.repo.working_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        return self._cat_file_proc
+    
+    def close(self) -> None:
+        """
+        Stop the background 'git cat-file' process and close the on-disk
+        diff cache, if either was started
+        """
+        # cached_property stores its value in __dict__ - look there so we
+        # don't open a cache just to close it
+        disk_cache = self.__dict__.get('_parsed_diff_cache')
+        if disk_cache is not None:
+            disk_cache.close()
+        
+        proc = self._cat_file_proc
+        if proc is None:
+            return
+        
+        self._cat_file_proc = None
+        if proc.poll() is None:
+            # Closing stdin tells git there are no more requests
+            proc.stdin.close()
+            proc.wait()
+        proc.stdout.close()
+    
+    def __del__(self):
+        # hasattr: __init__ may have failed before the attribute was set
+        if hasattr(self, '_cat_file_proc'):
+            self.close()
+    
     def stage_all_changes(self) -> None:
         """
         Stage all changes (like 'git add .')
         
         Useful for testing - adds all modified files to staging area
         """
+        if self.read_only:
+            print("❌ Cannot stage changes: repository was opened read-only")
+            return
+        
         try:
             self.repo.git.add(A=True)  # A=True means 'git add --all'
+            self._staged_changes_cache.clear()
+            self._staged_stats_cache.clear()
             print("✅ All changes staged")
         except GitCommandError as e:
             print(f"❌ Error staging changes: {e}")
@@ -195,8 +1025,24 @@ class GitHandler:
             "path": self.repo.working_dir,
             "branch": self.repo.active_branch.name,
             "has_changes": str(self.is_repo_dirty()),
-            "total_commits": str(len(list(self.repo.iter_commits()))),
+            "total_commits": str(self._count_commits()),
         }
+    
+    def _count_commits(self) -> int:
+        """
+        Count commits reachable from HEAD
+        
+        'git rev-list --count' walks history in C and prints one number,
+        instead of building a Python Commit object for every commit.
+        The result is remembered until HEAD moves.
+        """
+        head_sha = self.repo.head.commit.hexsha
+        
+        if self._commit_count is None or self._commit_count[0] != head_sha:
+            count = int(self.repo.git.rev_list('--count', head_sha))
+            self._commit_count = (head_sha, count)
+        
+        return self._commit_count[1]
 
 
 # Example usage (will remove this later, just for testing)
@@ -227,6 +1073,14 @@ if __name__ == "__main__":
         else:
             print("\n✨ No changes detected")
         
+        # Count changes (git does the counting - no patch is built)
+        for label, cached in (("Staged", True), ("Unstaged", False)):
+            files, additions, deletions = handler.get_summary_stats(cached=cached)
+            print(
+                f"\n📊 {label}: {files} file(s) changed: "
+                f"{additions} addition(s), {deletions} deletion(s)"
+            )
+        
         # Get diff
         diff = handler.get_all_changes()
         if diff:
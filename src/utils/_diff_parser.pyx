@@ -0,0 +1,69 @@
+# cython: language_level=3
+"""
+Compiled version of DiffParser's per-line loop
+
+Build it in place with:
+    cythonize -i src/utils/_diff_parser.pyx
+
+diff_parser.py picks it up automatically once it's built, and falls back
+to the pure Python code when it isn't.
+"""
+
+from cpython.unicode cimport PyUnicode_DecodeUTF8
+from libc.string cimport memchr
+
+
+cdef inline bint _is_space(char c):
+    # Same characters bytes.strip() removes
+    return c == 32 or c == 9 or c == 10 or c == 13 or c == 11 or c == 12
+
+
+cpdef tuple extract_changes(bytes file_diff):
+    """
+    Extract added and deleted lines from one file's diff chunk
+
+    Same rules and result as DiffParser._extract_changes, but the chunk
+    is walked with a raw pointer: memchr finds each newline, the first
+    byte says what kind of line it is, and only changed lines are turned
+    into Python strings.
+
+    Returns:
+        (additions, deletions) tuple of lists
+    """
+    cdef const char* pos = file_diff
+    cdef const char* end = pos + len(file_diff)
+    cdef const char* newline
+    cdef const char* start
+    cdef const char* stop
+    cdef char first
+    cdef list additions = []
+    cdef list deletions = []
+
+    while pos < end:
+        newline = <const char*>memchr(pos, 10, end - pos)
+        if newline == NULL:
+            newline = end
+
+        first = pos[0]
+
+        # '+' or '-' line, but not the '+++' / '---' file markers
+        if (first == 43 or first == 45) and not (
+            newline - pos >= 3 and pos[1] == first and pos[2] == first
+        ):
+            # Drop the +/- and strip surrounding whitespace, in place
+            start = pos + 1
+            stop = newline
+            while start < stop and _is_space(start[0]):
+                start += 1
+            while stop > start and _is_space(stop[-1]):
+                stop -= 1
+
+            line = PyUnicode_DecodeUTF8(start, stop - start, "replace")
+            if first == 43:
+                additions.append(line)
+            else:
+                deletions.append(line)
+
+        pos = newline + 1
+
+    return additions, deletions
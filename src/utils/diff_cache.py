@@ -0,0 +1,158 @@
+"""
+Diff Cache Module
+Keeps parsed diffs on disk so repeated runs can skip git and the parser
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from utils.diff_parser import FileDiff
+
+
+def default_cache_path() -> Path:
+    """
+    Where the cache lives: ~/.cache/sprout/diff_cache.sqlite
+    
+    Respects XDG_CACHE_HOME if it's set (the Linux convention for caches).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "sprout" / "diff_cache.sqlite"
+
+
+class DiffCache:
+    """
+    Small SQLite store of parsed diffs
+    
+    Entries are keyed by repository + HEAD commit + index state. The
+    staged diff can't change unless one of those does, so a hit can be
+    returned as-is - no need to ask git anything.
+    
+    Only the most recently used entries are kept (see max_entries), so the
+    file stays small no matter how many repos or commits it has seen.
+    """
+    
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 256):
+        """
+        Set up the cache (the database isn't opened until first use)
+        
+        Args:
+            path: SQLite file to use. If None, uses default_cache_path().
+            max_entries: How many diffs to keep before dropping the
+                         least recently used ones
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_entries = max_entries
+        self._connection = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database (creating it and its table if needed)
+        """
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS diff_cache ("
+                " repo TEXT,"
+                " head_sha TEXT,"
+                " index_mtime INTEGER,"
+                " index_size INTEGER,"
+                " payload BLOB,"
+                " last_used REAL,"
+                " PRIMARY KEY (repo, head_sha, index_mtime, index_size))"
+            )
+        return self._connection
+    
+    def get(
+        self, repo: str, head_sha: str, index_mtime: int, index_size: int
+    ) -> Optional[List[FileDiff]]:
+        """
+        Look up a parsed diff
+        
+        Args:
+            repo: Path of the repository's .git directory
+            head_sha: Commit HEAD points to
+            index_mtime: Index file's st_mtime_ns
+            index_size: Index file's st_size
+        
+        Returns:
+            The cached list of FileDiff, or None on a miss
+        """
+        key = (repo, head_sha, index_mtime, index_size)
+        
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT payload FROM diff_cache"
+                " WHERE repo = ? AND head_sha = ? AND index_mtime = ? AND index_size = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            
+            # Remember the hit so this entry survives the next cleanup
+            with connection:
+                connection.execute(
+                    "UPDATE diff_cache SET last_used = ?"
+                    " WHERE repo = ? AND head_sha = ? AND index_mtime = ? AND index_size = ?",
+                    (time.time(), *key),
+                )
+        except sqlite3.Error as e:
+            # A broken cache should never break the tool - just miss
+            print(f"⚠️  Diff cache unavailable: {e}")
+            return None
+        
+        return [
+            FileDiff(
+                file_path=file_path,
+                additions=additions,
+                deletions=deletions,
+                addition_count=len(additions),
+                deletion_count=len(deletions),
+            )
+            for file_path, additions, deletions in json.loads(row[0])
+        ]
+    
+    def put(
+        self,
+        repo: str,
+        head_sha: str,
+        index_mtime: int,
+        index_size: int,
+        files: List[FileDiff],
+    ) -> None:
+        """
+        Store a parsed diff (same key arguments as get())
+        """
+        # Counts are just len() of the lists, so only store the lists
+        payload = json.dumps(
+            [[f.file_path, f.additions, f.deletions] for f in files]
+        ).encode("utf-8")
+        
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO diff_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (repo, head_sha, index_mtime, index_size, payload, time.time()),
+                )
+                # Drop everything but the most recently used entries
+                connection.execute(
+                    "DELETE FROM diff_cache WHERE rowid NOT IN ("
+                    " SELECT rowid FROM diff_cache ORDER BY last_used DESC, rowid DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️  Diff cache unavailable: {e}")
+    
+    def close(self) -> None:
+        """
+        Close the database connection, if it was opened
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -3,9 +3,60 @@ Diff Parser Module
 Parses git diff output into structured, readable format
 """
 
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import Iterator, List, Dict, Tuple, Union
 import re
 
+try:
+    # Compiled line scanner from _diff_parser.pyx - only there if it's been
+    # built (cythonize -i src/utils/_diff_parser.pyx)
+    from ._diff_parser import extract_changes as _compiled_extract_changes
+except ImportError:
+    _compiled_extract_changes = None
+
+
+# Every file in a combined diff starts on a line like this
+_FILE_BOUNDARY = b'\ndiff --git'
+
+# File path in the "diff --git a/path b/path" header...
+_HEADER_PATH_RE = re.compile(rb'a/(.*?)\s+b/')
+
+# ...or, failing that, in the "+++ b/path" marker
+_NEW_FILE_PATH_RE = re.compile(rb'\+\+\+ b/(.*)')
+
+
+@dataclass(slots=True)
+class FileDiff:
+    """
+    One changed file from a parsed diff
+    
+    slots=True means no per-object __dict__: each entry is smaller and
+    attribute access is faster, which adds up over thousands of files.
+    """
+    file_path: str
+    additions: List[str]
+    deletions: List[str]
+    addition_count: int
+    deletion_count: int
+    
+    @property
+    def change_summary(self) -> str:
+        """Short summary like '+2, -1'"""
+        return f"+{self.addition_count}, -{self.deletion_count}"
+    
+    def to_dict(self) -> Dict[str, any]:
+        """
+        Same data as a plain dictionary (the format parse_diff used to return)
+        """
+        return {
+            'file_path': self.file_path,
+            'additions': self.additions,
+            'deletions': self.deletions,
+            'addition_count': self.addition_count,
+            'deletion_count': self.deletion_count,
+            'change_summary': self.change_summary,
+        }
+
 
 class DiffParser:
     """
@@ -21,39 +72,39 @@ class DiffParser:
     """
     
     @staticmethod
-    def parse_diff(diff_text: str) -> List[Dict[str, any]]:
+    def parse_diff(diff_text: Union[str, bytes]) -> List[FileDiff]:
         """
         Parse diff text into list of file changes
         
         Args:
-            diff_text: Raw git diff output
+            diff_text: Raw git diff output, as str or (faster) raw bytes
         
         Returns:
-            List of dictionaries, each representing a changed file
+            List of FileDiff objects, one per changed file
+            (call .to_dict() on one if you need a plain dictionary)
         
         Example return:
         [
-            {
-                'file_path': 'src/main.py',
-                'additions': ['print("hello")', 'x = 5'],
-                'deletions': ['print("goodbye")'],
-                'change_summary': '+2, -1'
-            }
+            FileDiff(
+                file_path='src/main.py',
+                additions=['print("hello")', 'x = 5'],
+                deletions=['print("goodbye")'],
+                addition_count=2,
+                deletion_count=1,
+            )
         ]
+        
+        The diff is scanned once as bytes: file boundaries are found with
+        bytes.find and only the file paths and changed lines get decoded.
+        If you only need counts, iter_parsed() is faster and streams.
         """
-        if not diff_text or not diff_text.strip():
+        if not diff_text:
             return []
         
-        # Split diff into chunks (one per file)
-        file_diffs = re.split(r'\ndiff --git', diff_text)
-        
         parsed_files = []
         
-        for file_diff in file_diffs:
-            if not file_diff.strip():
-                continue
-            
-            # Extract file path
+        for file_diff in DiffParser._split_files(DiffParser._to_bytes(diff_text)):
+            # Extract file path (chunks without one are just whitespace/noise)
             file_path = DiffParser._extract_file_path(file_diff)
             if not file_path:
                 continue
@@ -61,20 +112,72 @@ class DiffParser:
             # Extract additions and deletions
             additions, deletions = DiffParser._extract_changes(file_diff)
             
-            # Create summary
-            parsed_files.append({
-                'file_path': file_path,
-                'additions': additions,
-                'deletions': deletions,
-                'addition_count': len(additions),
-                'deletion_count': len(deletions),
-                'change_summary': f"+{len(additions)}, -{len(deletions)}"
-            })
+            parsed_files.append(FileDiff(
+                file_path=file_path,
+                additions=additions,
+                deletions=deletions,
+                addition_count=len(additions),
+                deletion_count=len(deletions),
+            ))
         
         return parsed_files
     
     @staticmethod
-    def _extract_file_path(file_diff: str) -> str:
+    def iter_parsed(diff_text: Union[str, bytes]) -> Iterator[Tuple[str, int, int]]:
+        """
+        Stream (file_path, addition_count, deletion_count) for each file
+        
+        Args:
+            diff_text: Raw git diff output, as str or (faster) raw bytes
+        
+        Unlike parse_diff, nothing is kept in memory: files are yielded one
+        at a time and the changed lines are only counted, never decoded or
+        stored. Use this for big diffs when you don't need the line text.
+        
+        Example:
+            for path, added, removed in DiffParser.iter_parsed(diff):
+                print(f"{path}: +{added}, -{removed}")
+        """
+        if not diff_text:
+            return
+        
+        for file_diff in DiffParser._split_files(DiffParser._to_bytes(diff_text)):
+            file_path = DiffParser._extract_file_path(file_diff)
+            if not file_path:
+                continue
+            
+            additions, deletions = DiffParser._count_changes(file_diff)
+            yield file_path, additions, deletions
+    
+    @staticmethod
+    def _to_bytes(diff_text: Union[str, bytes]) -> bytes:
+        """
+        Get diff text as bytes (encoding it once if it's a str)
+        """
+        if isinstance(diff_text, str):
+            return diff_text.encode('utf-8', errors='surrogateescape')
+        return diff_text
+    
+    @staticmethod
+    def _split_files(diff_bytes: bytes) -> Iterator[bytes]:
+        """
+        Split a combined diff into one chunk per file
+        
+        Yields each chunk as it's found, so the whole diff is walked once
+        and never copied into an intermediate list.
+        """
+        start = 0
+        while True:
+            boundary = diff_bytes.find(_FILE_BOUNDARY, start)
+            if boundary == -1:
+                yield diff_bytes[start:]
+                return
+            
+            yield diff_bytes[start:boundary]
+            start = boundary + 1  # keep 'diff --git', drop the newline
+    
+    @staticmethod
+    def _extract_file_path(file_diff: bytes) -> str:
         """
         Extract file path from diff chunk
         
@@ -85,19 +188,19 @@ class DiffParser:
         +++ b/src/main.py
         """
         # Try to find "a/filepath b/filepath" pattern
-        match = re.search(r'a/(.*?)\s+b/', file_diff)
+        match = _HEADER_PATH_RE.search(file_diff)
         if match:
-            return match.group(1)
+            return match.group(1).decode('utf-8', errors='replace')
         
         # Try to find "+++ b/filepath" pattern
-        match = re.search(r'\+\+\+ b/(.*)', file_diff)
+        match = _NEW_FILE_PATH_RE.search(file_diff)
         if match:
-            return match.group(1).strip()
+            return match.group(1).strip().decode('utf-8', errors='replace')
         
         return ""
     
     @staticmethod
-    def _extract_changes(file_diff: str) -> tuple:
+    def _extract_changes(file_diff: bytes) -> tuple:
         """
         Extract added and deleted lines from diff
         
@@ -108,25 +211,49 @@ class DiffParser:
         Returns:
             (additions, deletions) tuple of lists
         """
-        additions = []
-        deletions = []
+        if _compiled_extract_changes is not None:
+            # Same result, computed in C
+            return _compiled_extract_changes(file_diff)
         
-        lines = file_diff.split('\n')
+        lines = file_diff.split(b'\n')
         
-        for line in lines:
-            # Skip file markers and chunk headers
-            if line.startswith('+++') or line.startswith('---'):
-                continue
-            if line.startswith('@@'):
-                continue
-            
-            # Addition
-            if line.startswith('+'):
-                additions.append(line[1:].strip())  # Remove the +
-            
-            # Deletion
-            elif line.startswith('-'):
-                deletions.append(line[1:].strip())  # Remove the -
+        # List comprehensions run their loop without a Python-level
+        # .append call per line, so two of them beat one explicit loop
+        additions = [
+            line[1:].strip().decode('utf-8', errors='replace')  # Remove the +
+            for line in lines
+            if line[:1] == b'+' and not line.startswith(b'+++')
+        ]
+        deletions = [
+            line[1:].strip().decode('utf-8', errors='replace')  # Remove the -
+            for line in lines
+            if line[:1] == b'-' and not line.startswith(b'---')
+        ]
+        
+        return additions, deletions
+    
+    @staticmethod
+    def _count_changes(file_diff: bytes) -> Tuple[int, int]:
+        """
+        Count added and deleted lines without extracting them
+        
+        Same rules as _extract_changes, but done with bytes.count, which
+        runs in C over the whole chunk instead of a Python loop per line.
+        
+        Returns:
+            (additions, deletions) tuple of counts
+        """
+        # Every line except the first starts right after a newline.
+        # '\n+++' lines are file markers, so take them back out.
+        additions = file_diff.count(b'\n+') - file_diff.count(b'\n+++')
+        deletions = file_diff.count(b'\n-') - file_diff.count(b'\n---')
+        
+        # The first line has no newline in front of it
+        first = file_diff[:1]
+        if first == b'+' and not file_diff.startswith(b'+++'):
+            additions += 1
+        elif first == b'-' and not file_diff.startswith(b'---'):
+            deletions += 1
         
         return additions, deletions
     
@@ -141,14 +268,16 @@ class DiffParser:
         Returns:
             Summary string like "3 files changed: 12 additions, 5 deletions"
         """
-        parsed = DiffParser.parse_diff(diff_text)
+        file_count = total_additions = total_deletions = 0
         
-        if not parsed:
-            return "No changes detected"
+        # One streaming pass - no line text is kept around
+        for _, additions, deletions in DiffParser.iter_parsed(diff_text):
+            file_count += 1
+            total_additions += additions
+            total_deletions += deletions
         
-        total_additions = sum(f['addition_count'] for f in parsed)
-        total_deletions = sum(f['deletion_count'] for f in parsed)
-        file_count = len(parsed)
+        if not file_count:
+            return "No changes detected"
         
         return (
             f"{file_count} file(s) changed: "
@@ -177,9 +306,9 @@ index 1234567..abcdefg 100644
     
     print("Parsed result:")
     for file_data in parsed:
-        print(f"\n📄 File: {file_data['file_path']}")
-        print(f"   Changes: {file_data['change_summary']}")
-        print(f"   Additions: {file_data['additions']}")
-        print(f"   Deletions: {file_data['deletions']}")
+        print(f"\n📄 File: {file_data.file_path}")
+        print(f"   Changes: {file_data.change_summary}")
+        print(f"   Additions: {file_data.additions}")
+        print(f"   Deletions: {file_data.deletions}")
     
     print(f"\n📊 Summary: {parser.get_summary(sample_diff)}")
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Test script for DiffCache
+Checks that parsed diffs survive a round trip through the SQLite file
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to Python path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.diff_cache import DiffCache
+from utils.diff_parser import DiffParser
+
+
+SAMPLE_DIFF = """diff --git a/src/main.py b/src/main.py
+index 1234567..abcdefg 100644
+--- a/src/main.py
++++ b/src/main.py
+@@ -1,3 +1,4 @@
+ def hello():
+-    print("old")
++    print("new")
++    return True
+"""
+
+
+def test_round_trip():
+    """What goes in comes back out, only for the exact same key"""
+    parsed = DiffParser.parse_diff(SAMPLE_DIFF)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiffCache(Path(tmp) / "cache.sqlite")
+        assert cache.get("/repo/.git", "abc123", 1, 100) is None
+        
+        cache.put("/repo/.git", "abc123", 1, 100, parsed)
+        assert cache.get("/repo/.git", "abc123", 1, 100) == parsed
+        
+        # Any change to HEAD or the index is a miss
+        assert cache.get("/repo/.git", "def456", 1, 100) is None
+        assert cache.get("/repo/.git", "abc123", 2, 100) is None
+        assert cache.get("/other/.git", "abc123", 1, 100) is None
+        cache.close()
+
+
+def test_keeps_most_recent_entries():
+    """Old entries are dropped once max_entries is reached"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiffCache(Path(tmp) / "cache.sqlite", max_entries=2)
+        cache.put("/repo/.git", "first", 1, 100, [])
+        cache.put("/repo/.git", "second", 1, 100, [])
+        cache.put("/repo/.git", "third", 1, 100, [])
+        
+        assert cache.get("/repo/.git", "first", 1, 100) is None
+        assert cache.get("/repo/.git", "second", 1, 100) == []
+        assert cache.get("/repo/.git", "third", 1, 100) == []
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_keeps_most_recent_entries()
+    print("✅ ALL TESTS PASSED!")
@@ -0,0 +1,132 @@
+"""
+Test script for DiffParser
+Checks that diffs are split into files and lines are counted correctly
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Add src to Python path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import diff_parser
+from utils.diff_parser import DiffParser
+
+
+SAMPLE_DIFF = """diff --git a/src/main.py b/src/main.py
+index 1234567..abcdefg 100644
+--- a/src/main.py
++++ b/src/main.py
+@@ -1,3 +1,4 @@
+ def hello():
+-    print("old")
++    print("new")
++    return True
+diff --git a/README.md b/README.md
+deleted file mode 100644
+index 1234567..0000000
+--- a/README.md
++++ /dev/null
+@@ -1,2 +0,0 @@
+-# Title
+--- not a file marker, but starts with ---
+"""
+
+
+def test_parse_diff():
+    """Each file in the diff becomes one entry with its own lines"""
+    parsed = DiffParser.parse_diff(SAMPLE_DIFF)
+    
+    assert [f.file_path for f in parsed] == ['src/main.py', 'README.md']
+    
+    main = parsed[0]
+    assert main.additions == ['print("new")', 'return True']
+    assert main.deletions == ['print("old")']
+    assert main.change_summary == "+2, -1"
+    
+    # Lines starting with '---' are skipped like the file marker is
+    readme = parsed[1]
+    assert readme.additions == []
+    assert readme.deletions == ['# Title']
+
+
+def test_to_dict():
+    """to_dict() gives back the old dictionary format"""
+    main = DiffParser.parse_diff(SAMPLE_DIFF)[0]
+    
+    assert main.to_dict() == {
+        'file_path': 'src/main.py',
+        'additions': ['print("new")', 'return True'],
+        'deletions': ['print("old")'],
+        'addition_count': 2,
+        'deletion_count': 1,
+        'change_summary': "+2, -1",
+    }
+
+
+def test_parse_diff_bytes():
+    """Raw bytes from git give the same result as decoded text"""
+    assert DiffParser.parse_diff(SAMPLE_DIFF.encode('utf-8')) == DiffParser.parse_diff(SAMPLE_DIFF)
+
+
+def test_iter_parsed():
+    """Streaming counts match what parse_diff finds"""
+    streamed = list(DiffParser.iter_parsed(SAMPLE_DIFF))
+    parsed = [
+        (f.file_path, f.addition_count, f.deletion_count)
+        for f in DiffParser.parse_diff(SAMPLE_DIFF)
+    ]
+    
+    assert streamed == parsed == [('src/main.py', 2, 1), ('README.md', 0, 1)]
+
+
+def test_empty_diff():
+    """No diff means no files"""
+    assert DiffParser.parse_diff("") == []
+    assert DiffParser.parse_diff("\n\n") == []
+    assert list(DiffParser.iter_parsed("")) == []
+    assert DiffParser.get_summary("") == "No changes detected"
+
+
+def test_get_summary():
+    """Summary adds up every file"""
+    assert DiffParser.get_summary(SAMPLE_DIFF) == (
+        "2 file(s) changed: 2 addition(s), 2 deletion(s)"
+    )
+
+
+@pytest.mark.skipif(
+    diff_parser._compiled_extract_changes is None,
+    reason="compiled parser not built (cythonize -i src/utils/_diff_parser.pyx)",
+)
+def test_compiled_extract_changes():
+    """The Cython line scanner gives exactly what the Python code does"""
+    chunks = list(DiffParser._split_files(SAMPLE_DIFF.encode('utf-8')))
+    chunks += [
+        b'',
+        b'++',
+        b'+\xff',
+        b'+added\n-removed\n context\n+no trailing newline',
+        b'+++ b/file\n--- a/file\n+  padded \r\n-\t\n+\n-',
+    ]
+    
+    for chunk in chunks:
+        compiled = diff_parser._compiled_extract_changes(chunk)
+        with mock.patch.object(diff_parser, '_compiled_extract_changes', None):
+            python = DiffParser._extract_changes(chunk)
+        assert compiled == python, chunk
+
+
+if __name__ == "__main__":
+    test_parse_diff()
+    test_to_dict()
+    test_parse_diff_bytes()
+    test_iter_parsed()
+    test_empty_diff()
+    test_get_summary()
+    if diff_parser._compiled_extract_changes is not None:
+        test_compiled_extract_changes()
+    print("✅ ALL TESTS PASSED!")
@@ -1,10 +1,17 @@
 """
 Test script for GitHandler
 This lets us manually test our Git functionality
+
+The test_* functions below the manual test build a throwaway repository
+in a temp directory, so they run anywhere 'git' is installed.
 """
 
+import os
+import subprocess
 import sys
+import tempfile
 from pathlib import Path
+from unittest import mock
 
 # Add src to Python path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -77,6 +84,16 @@ def test_git_handler():
         else:
             print("No changes detected")
         
+        # Test 6: Committed content of the changed files (one git process)
+        print("\n" + "=" * 50)
+        print("TEST 6: Committed File Contents")
+        print("=" * 50)
+        contents = handler.get_file_contents(changed)
+        for path, content in contents.items():
+            size = f"{len(content)} characters" if content is not None else "not in HEAD"
+            print(f"  📄 {path}: {size}")
+        handler.close()
+        
         print("\n" + "=" * 50)
         print("✅ ALL TESTS PASSED!")
         print("=" * 50)
@@ -87,5 +104,246 @@ def test_git_handler():
         traceback.print_exc()
 
 
+def _git(repo: Path, *args: str) -> None:
+    """Run a git command in repo, the way a user in a terminal would"""
+    subprocess.run(
+        ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_repo(tmp: str) -> Path:
+    """A repository with one commit containing a few files"""
+    repo = Path(tmp)
+    _git(repo, 'init', '-q')
+    (repo / 'a.txt').write_text("first\n")
+    (repo / 'b.txt').write_text("second\n")
+    (repo / 'with space.txt').write_text("spaced\n")
+    (repo / 'docs').mkdir()
+    (repo / 'docs' / 'guide.md').write_text("# Guide\n")
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'initial')
+    return repo
+
+
+def test_get_file_contents():
+    """Missing, spaced and directory paths don't break the cat-file framing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = GitHandler(str(_make_repo(tmp)), backend="gitpython")
+        
+        contents = handler.get_file_contents([
+            'a.txt',
+            'no such.txt',
+            'with space.txt',
+            'docs',
+            'a.txt\nb.txt',
+            'b.txt',
+        ])
+        
+        assert contents == {
+            'a.txt': "first\n",
+            'no such.txt': None,
+            'with space.txt': "spaced\n",
+            'docs': None,
+            'a.txt\nb.txt': None,
+            'b.txt': "second\n",
+        }
+        
+        # Later calls still get their own reply, not a leftover one
+        assert handler.get_file_contents(['b.txt']) == {'b.txt': "second\n"}
+        assert handler.get_file_content('no such.txt', rev='HEAD') is None
+        assert handler.get_file_content('docs/guide.md', rev='HEAD') == "# Guide\n"
+        handler.close()
+
+
+def test_staged_cache_follows_external_git():
+    """git add / commit / reset run outside the handler invalidate the cache"""
+    for backend in ("pygit2", "gitpython"):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = _make_repo(tmp)
+            handler = GitHandler(str(repo), backend=backend)
+            assert handler.get_staged_changes() == ""
+            
+            (repo / 'a.txt').write_text("changed\n")
+            _git(repo, 'add', 'a.txt')
+            assert "+changed" in handler.get_staged_changes(), backend
+            
+            _git(repo, 'commit', '-q', '-m', 'change a')
+            assert handler.get_staged_changes() == "", backend
+            
+            _git(repo, 'reset', '-q', '--soft', 'HEAD~1')
+            assert "+changed" in handler.get_staged_changes(), backend
+
+
+def test_del_stops_cat_file():
+    """Dropping the last reference closes the handler - no gc cycle needed"""
+    for backend in ("pygit2", "gitpython"):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = GitHandler(str(_make_repo(tmp)), backend=backend)
+            handler.get_staged_changes()
+            handler.get_summary_stats(cached=True)
+            handler.get_file_contents(['a.txt'])
+            proc = handler._cat_file_proc
+            
+            del handler
+            assert proc.poll() is not None, backend
+
+
+def test_staged_cache_ignores_other_index():
+    """With GIT_INDEX_FILE set, the staged diff comes from that index"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = _make_repo(tmp)
+        handler = GitHandler(str(repo), backend="gitpython")
+        assert handler.get_staged_changes() == ""
+        
+        other_index = str(Path(tmp) / '.git' / 'other-index')
+        with mock.patch.dict(os.environ, {'GIT_INDEX_FILE': other_index}):
+            _git(repo, 'read-tree', 'HEAD')
+            (repo / 'a.txt').write_text("changed\n")
+            _git(repo, 'add', 'a.txt')
+            assert "+changed" in handler.get_staged_changes()
+        
+        assert handler.get_staged_changes() == ""
+
+
+def test_get_changed_files():
+    """Both backends list staged, then unstaged, then untracked files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = _make_repo(tmp)
+        (repo / 'zz.txt').write_text("last\n")
+        _git(repo, 'add', 'zz.txt')
+        _git(repo, 'commit', '-q', '-m', 'add zz')
+        
+        (repo / 'a.txt').write_text("staged\n")
+        _git(repo, 'add', 'a.txt')
+        (repo / 'b.txt').write_text("unstaged\n")
+        (repo / 'zz.txt').write_text("unstaged, sorts after newdir/\n")
+        _git(repo, 'rm', '-q', 'docs/guide.md')
+        (repo / 'with space.txt').write_text("staged\n")
+        _git(repo, 'add', 'with space.txt')
+        (repo / 'with space.txt').write_text("and modified again\n")
+        (repo / 'newdir' / 'sub').mkdir(parents=True)
+        (repo / 'newdir' / 'sub' / 'n.txt').write_text("new\n")
+        (repo / 'ünew.txt').write_text("new\n")
+        
+        for backend in ("pygit2", "gitpython"):
+            handler = GitHandler(str(repo), backend=backend)
+            assert handler.get_changed_files() == [
+                'a.txt',
+                'docs/guide.md',
+                'with space.txt',
+                'b.txt',
+                'zz.txt',
+                'newdir/sub/n.txt',
+                'ünew.txt',
+            ], backend
+
+
+def test_get_all_changes():
+    """Staged and unstaged diffs are combined, or summarized when too big"""
+    for backend in ("pygit2", "gitpython"):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = _make_repo(tmp)
+            (repo / 'a.txt').write_text("staged\n")
+            _git(repo, 'add', 'a.txt')
+            (repo / 'b.txt').write_text("unstaged\n")
+            
+            handler = GitHandler(str(repo), backend=backend)
+            changes = handler.get_all_changes()
+            assert "+staged" in changes and "+unstaged" in changes, backend
+            assert handler.get_summary_stats(cached=True) == (1, 1, 1), backend
+            assert handler.get_summary_stats(cached=False) == (1, 1, 1), backend
+            
+            handler.max_diff_files = 1
+            assert handler.get_all_changes().startswith("⚠️  Diff too large"), backend
+
+
+def test_disk_cache_closed():
+    """Parsed diffs come back from disk, and close() releases the database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'repo').mkdir()
+        repo = _make_repo(str(Path(tmp) / 'repo'))
+        (repo / 'a.txt').write_text("staged\n")
+        _git(repo, 'add', 'a.txt')
+        
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(Path(tmp) / 'cache')}):
+            handler = GitHandler(str(repo), disk_cache=True)
+            parsed = handler.get_parsed_staged_changes()
+            assert [f.file_path for f in parsed] == ['a.txt']
+            assert GitHandler(str(repo), disk_cache=True).get_parsed_staged_changes() == parsed
+            
+            cache = handler._parsed_diff_cache
+            handler.close()
+            assert cache._connection is None
+
+
+def test_disk_cache_skips_failed_diff():
+    """A diff that fails is not saved to disk as 'no staged changes'"""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'repo').mkdir()
+        repo = _make_repo(str(Path(tmp) / 'repo'))
+        (repo / 'a.txt').write_text("staged\n")
+        _git(repo, 'add', 'a.txt')
+        
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(Path(tmp) / 'cache')}):
+            handler = GitHandler(str(repo), disk_cache=True)
+            failure = subprocess.CalledProcessError(128, 'git diff')
+            with mock.patch.object(GitHandler, '_read_staged_changes', side_effect=failure):
+                assert handler.get_parsed_staged_changes() == []
+            
+            head_sha, index_mtime, index_size, _ = handler._diff_cache_key()
+            assert handler._parsed_diff_cache.get(
+                handler._git_dir, head_sha, index_mtime, index_size
+            ) is None
+            
+            parsed = GitHandler(str(repo), disk_cache=True).get_parsed_staged_changes()
+            assert [f.file_path for f in parsed] == ['a.txt']
+            handler.close()
+
+
+def test_binary_attribute_from_commit():
+    """Files marked binary in the commit's .gitattributes are never read"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = _make_repo(str(Path(tmp)))
+        (repo / '.gitattributes').write_text("*.png binary\n")
+        (repo / 'pic.png').write_text("img")
+        _git(repo, 'add', '-A')
+        _git(repo, 'commit', '-q', '-m', 'add picture')
+        
+        for backend in ("pygit2", "gitpython"):
+            handler = GitHandler(str(repo), backend=backend)
+            assert handler.get_file_contents(['pic.png', 'a.txt']) == {
+                'pic.png': None,
+                'a.txt': "first\n",
+            }, backend
+            handler.close()
+        
+        # A bare clone has no working directory to read .gitattributes from
+        bare = Path(tmp) / 'bare.git'
+        _git(repo, 'clone', '-q', '--bare', str(repo), str(bare))
+        handler = GitHandler(str(bare), read_only=True)
+        assert handler.get_staged_changes() == ""
+        assert handler.get_unstaged_changes() == ""
+        assert handler.get_all_changes() == ""
+        assert handler.get_changed_files() == []
+        assert handler.get_summary_stats(cached=True) == (0, 0, 0)
+        assert handler.get_file_content('pic.png') is None
+        assert handler.get_file_content('a.txt') == "first\n"
+        assert handler.get_file_content('docs') is None
+        assert handler.get_file_content('no such.txt') is None
+        handler.close()
+
+
 if __name__ == "__main__":
-    test_git_handler()
\ No newline at end of file
+    test_git_handler()
+    test_get_file_contents()
+    test_staged_cache_follows_external_git()
+    test_del_stops_cat_file()
+    test_staged_cache_ignores_other_index()
+    test_get_changed_files()
+    test_get_all_changes()
+    test_disk_cache_closed()
+    test_disk_cache_skips_failed_diff()
+    test_binary_attribute_from_commit()